@@ -1,7 +1,26 @@
 import json
+import os
 import boto3
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# Created once per Lambda container so warm invocations reuse the client's
+# connection pool instead of paying for endpoint setup and a TLS handshake.
+# Note: You will need to set COMPLIANCE_TOPIC_ARN to the ARN of your SNS topic.
+_TOPIC_ARN = os.environ.get('COMPLIANCE_TOPIC_ARN', 'arn:aws:sns:us-east-1:123456789012:compliance-alerts')
+# SNS only accepts a publish in the topic's own region, which is the 4th ARN field
+_SNS = boto3.client('sns', region_name=_TOPIC_ARN.split(':')[3])
+
+# SNS publishes run in the background while the handler finishes its own work
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# Config rules whose violations are treated as HIGH severity
+_HIGH_SEVERITY = frozenset({
+    's3-bucket-public-access-prohibited',
+    'iam-root-access-key-check',
+    'encrypted-volumes'
+})
+
 def lambda_handler(event, context):
     """
     Log compliance violations and send notifications
@@ -22,12 +41,21 @@ def lambda_handler(event, context):
         'request_id': context.aws_request_id
     }
     
+    # Send notification for high-severity violations. The publish starts in
+    # the background so it overlaps with logging below.
+    pending_notification = None
+    if log_entry['severity'] == 'HIGH':
+        pending_notification = send_notification(log_entry)
+    
     # Log the violation (appears in CloudWatch Logs)
     print(f"COMPLIANCE VIOLATION: {json.dumps(log_entry)}")
     
-    # Send notification for high-severity violations
-    if log_entry['severity'] == 'HIGH':
-        send_notification(log_entry)
+    # Lambda freezes the container once the handler returns, so wait for the
+    # background publish to be delivered before we finish. There is no time
+    # limit: failing while the publish is still running would let the retry
+    # send a second alert. A publish error still fails the invocation.
+    if pending_notification is not None:
+        pending_notification.result()
     
     return {
         'statusCode': 200,
@@ -36,20 +64,14 @@ def lambda_handler(event, context):
 
 def determine_severity(violation_type):
     """Determine violation severity based on rule type"""
-    high_severity_rules = [
-        's3-bucket-public-access-prohibited',
-        'iam-root-access-key-check',
-        'encrypted-volumes'
-    ]
-    
-    if violation_type in high_severity_rules:
-        return 'HIGH'
-    return 'MEDIUM'
+    return 'HIGH' if violation_type in _HIGH_SEVERITY else 'MEDIUM'
 
 def send_notification(log_entry):
-    """Send SNS notification for high-severity violations"""
-    sns = boto3.client('sns')
-    
+    """
+    Send SNS notification for high-severity violations.
+    The publish runs on a background thread; the returned Future
+    completes once SNS has accepted the message.
+    """
     message = f"""
     URGENT: High-severity compliance violation detected
     
@@ -59,9 +81,9 @@ def send_notification(log_entry):
     Time: {log_entry['timestamp']}
     """
     
-    # Note: You will need to replace this ARN with the ARN of your SNS topic.
-    sns.publish(
-        TopicArn='arn:aws:sns:us-east-1:123456789012:compliance-alerts',
+    return _EXECUTOR.submit(
+        _SNS.publish,
+        TopicArn=_TOPIC_ARN,
         Message=message,
         Subject="AWS Compliance Alert - Immediate Action Required"
     )
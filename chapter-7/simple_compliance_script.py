@@ -1,13 +1,21 @@
+import csv
 import json
 
+# orjson parses large inventories much faster; use it when it is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 # Function to load bucket data from a JSON file
 def load_buckets(path):
     """
     Reads a JSON file containing a list of bucket configurations
     and returns it as a Python list of dictionaries.
     """
-    with open(path) as f:
-        return json.load(f)
+    with open(path, 'rb') as f:
+        return _json_loads(f.read())
 
 # Function to check whether a bucket has server-side encryption enabled
 def check_encryption(bucket):
@@ -23,23 +31,21 @@ def main():
     # Load the list of buckets from an input JSON file
     buckets = load_buckets("buckets.json")
 
-    # Open (or create) a CSV file to record encryption status
-    with open("encryption_report.csv", "w") as report:
-        # Write the header row for the CSV
-        report.write("Bucket,Encrypted\n")
-
-        # Iterate over each bucket configuration
-        for b in buckets:
-            name      = b["Name"]                # Bucket name
-            encrypted = check_encryption(b)      # Boolean result of our check
-
-            # Write a line in the CSV: bucket name and True/False
-            report.write(f"{name},{encrypted}\n")
-
-            # If the bucket is not encrypted, print a console warning
-            # This provides immediate feedback when running the script manually
-            if not encrypted:
-                print(f"Warning: {name} is not encrypted")
+    # Pair each bucket name with the True/False result of our check
+    rows = [(b["Name"], check_encryption(b)) for b in buckets]
+
+    # Open (or create) a CSV file to record encryption status.
+    # csv.writer handles quoting for us and writes all rows in one call.
+    with open("encryption_report.csv", "w", newline="") as report:
+        writer = csv.writer(report, lineterminator="\n")
+        writer.writerow(["Bucket", "Encrypted"])   # Header row
+        writer.writerows(rows)
+
+    # If any bucket is not encrypted, print console warnings in one go
+    # This provides immediate feedback when running the script manually
+    warnings = [f"Warning: {name} is not encrypted" for name, encrypted in rows if not encrypted]
+    if warnings:
+        print("\n".join(warnings))
 
 # This conditional ensures that main() only runs when the script is executed directly,
 # and not when imported as a module in another script or test suite.
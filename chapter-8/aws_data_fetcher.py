@@ -19,21 +19,39 @@ All functions return plain Python data structures (lists / dicts) so that later
 chapters can transform or export them.
 """
 
+import itertools
+import weakref
 import boto3
+from concurrent.futures import ThreadPoolExecutor
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from datetime import datetime, timedelta
 
-def create_aws_session(profile_name=None, region_name='us-east-1'):
+# Shared client settings: a connection pool large enough for the threaded
+# paginators, adaptive retries to ride out API throttling, and TCP keep-alive
+# so long pagination runs reuse their connections.
+CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    tcp_keepalive=True
+)
+
+# session -> {service name: client}; entries disappear with their session
+_CLIENT_CACHE = weakref.WeakKeyDictionary()
+
+def create_aws_session(profile_name=None, region_name='us-east-1', validate=False):
     """
     Create an AWS session with optional profile and region.
     
     AWS sessions encapsulate your credentials and configuration,
     allowing you to make API calls to AWS services. This function
-    creates a session and tests it to ensure credentials are valid.
+    creates a session and checks that credentials can be found locally.
     
     Args:
         profile_name: AWS CLI profile name (None for default profile)
         region_name: AWS region to connect to (defaults to us-east-1)
+        validate: Also confirm the credentials with AWS STS (one extra
+            network round-trip)
     
     Returns:
         boto3.Session object if successful, None if failed
@@ -44,9 +62,16 @@ def create_aws_session(profile_name=None, region_name='us-east-1'):
         else:
             session = boto3.Session(region_name=region_name)
         
-        # Test the session by calling AWS STS (Security Token Service)
-        # This verifies our credentials work without doing anything destructive
-        session.client('sts').get_caller_identity()
+        # Make sure credentials were resolved (env vars, profile, instance role…)
+        # This is a local check – no request is sent to AWS
+        credentials = session.get_credentials()
+        if credentials is None or credentials.get_frozen_credentials().access_key is None:
+            raise NoCredentialsError()
+        
+        if validate:
+            # Test the credentials by calling AWS STS (Security Token Service)
+            # This verifies our credentials work without doing anything destructive
+            session.client('sts').get_caller_identity()
         return session
     
     except NoCredentialsError:
@@ -56,44 +81,76 @@ def create_aws_session(profile_name=None, region_name='us-east-1'):
         print(f"Error creating AWS session: {e}")
         return None
 
+def get_client(session, service_name):
+    """
+    Returns a boto3 client for `service_name` configured with CLIENT_CONFIG.
+
+    Clients are cached per session, so sweeping many Config rules only pays
+    the client construction cost (endpoint + service model loading) once.
+    Clients are thread-safe and can be shared by the threaded paginators.
+    """
+    clients = _CLIENT_CACHE.setdefault(session, {})
+    if service_name not in clients:
+        clients[service_name] = session.client(service_name, config=CLIENT_CONFIG)
+    return clients[service_name]
+
+def _paginate_securityhub_findings(client, filters):
+    """Runs one get_findings paginator to completion and returns its findings."""
+    findings = []
+    for page in client.get_paginator("get_findings").paginate(Filters=filters):
+        findings.extend(page["Findings"])
+    return findings
+
 def fetch_securityhub_failures(session, severity_labels):
     """
     Returns a list of Security Hub findings with ComplianceStatus=FAILED
     and SeverityLabel matching the specified severity levels.
+
+    Each severity label is paginated on its own thread so the page
+    round-trips overlap instead of running one after another.
     """
-    client = session.client("securityhub")
-    paginator = client.get_paginator("get_findings")
-    filters = {
-        "ComplianceStatus": [{"Value": "FAILED", "Comparison": "EQUALS"}],
-        "SeverityLabel": [
-            {"Value": lbl, "Comparison": "EQUALS"} for lbl in severity_labels
-        ]
-    }
-    
-    findings = []
+    if not severity_labels:
+        return []
+
+    client = get_client(session, "securityhub")
+    label_filters = [
+        {
+            "ComplianceStatus": [{"Value": "FAILED", "Comparison": "EQUALS"}],
+            "SeverityLabel": [{"Value": lbl, "Comparison": "EQUALS"}]
+        }
+        # A repeated label would otherwise be fetched (and returned) twice
+        for lbl in dict.fromkeys(severity_labels)
+    ]
+
     try:
-        for page in paginator.paginate(Filters=filters):
-            findings.extend(page["Findings"])
+        with ThreadPoolExecutor(max_workers=len(label_filters)) as executor:
+            per_label = list(executor.map(
+                lambda filters: _paginate_securityhub_findings(client, filters),
+                label_filters
+            ))
     except ClientError as e:
         print(f"Error fetching Security Hub findings: {e}")
         return []
     
-    return findings
+    return list(itertools.chain.from_iterable(per_label))
 
 def fetch_config_noncompliance(session, rule_name):
     """
     Returns a list of evaluation results where ComplianceType=NON_COMPLIANT
     for the specified Config rule.
     """
-    client = session.client("config")
+    client = get_client(session, "config")
     paginator = client.get_paginator("get_compliance_details_by_config_rule")
 
     results = []
     try:
-        for page in paginator.paginate(ConfigRuleName=rule_name):
-            for evaluation in page["EvaluationResults"]:
-                if evaluation["ComplianceType"] == "NON_COMPLIANT":
-                    results.append(evaluation)
+        # Let Config filter server-side and return the maximum page size (100)
+        for page in paginator.paginate(
+            ConfigRuleName=rule_name,
+            ComplianceTypes=["NON_COMPLIANT"],
+            PaginationConfig={"PageSize": 100}
+        ):
+            results.extend(page["EvaluationResults"])
     except ClientError as e:
         print(f"Error fetching Config compliance details for rule {rule_name}: {e}")
         return []
@@ -101,12 +158,15 @@ def fetch_config_noncompliance(session, rule_name):
     return results
 
 def fetch_cloudtrail_events(session, lookup_attributes,
-                            start_time=None, end_time=None):
+                            start_time=None, end_time=None, event_category=None):
     """
     Returns a list of CloudTrail events matching lookup_attributes
     within the specified time range.
+
+    Pass event_category="insight" to have CloudTrail return only Insights
+    events. Throttled requests are retried by CLIENT_CONFIG's adaptive mode.
     """
-    client = session.client("cloudtrail")
+    client = get_client(session, "cloudtrail")
     paginator = client.get_paginator("lookup_events")
 
     if end_time is None:
@@ -114,13 +174,19 @@ def fetch_cloudtrail_events(session, lookup_attributes,
     if start_time is None:
         start_time = end_time - timedelta(days=1)
 
+    params = {
+        "LookupAttributes": lookup_attributes,
+        "StartTime": start_time,
+        "EndTime": end_time,
+        # 50 events is the most lookup_events returns per page
+        "PaginationConfig": {"PageSize": 50}
+    }
+    if event_category:
+        params["EventCategory"] = event_category
+
     events = []
     try:
-        for page in paginator.paginate(
-            LookupAttributes=lookup_attributes,
-            StartTime=start_time,
-            EndTime=end_time
-        ):
+        for page in paginator.paginate(**params):
             events.extend(page["Events"])
                 
     except ClientError as e:
@@ -16,9 +16,14 @@ What beginners should know
   structures returned by AWS APIs.
 """
 
+import itertools
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+# Column prefix for resource tags flattened by expand_resources()
+TAG_PREFIX = "Tag_"
+
 def findings_to_dataframe(findings: list[dict]) -> pd.DataFrame:
     """
     Converts a list of Security Hub findings into a flat DataFrame.
@@ -49,12 +54,31 @@ def findings_to_dataframe(findings: list[dict]) -> pd.DataFrame:
             if col in df.columns:
                 df[col] = pd.to_datetime(df[col], errors='coerce')
                 
-        return df
+        return to_arrow_strings(df)
         
     except Exception as e:
         print(f"Error processing findings to DataFrame: {e}")
         return pd.DataFrame()
 
+def to_arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stores text columns as Arrow-backed strings instead of Python objects.
+    Requires `pip install pyarrow`; the DataFrame is returned unchanged without it.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return df
+
+    # Only plain-text columns are converted – nested lists/dicts such as
+    # `Resources` must stay as Python objects for `expand_resources()`.
+    string_columns = {
+        col: "string[pyarrow]"
+        for col in df.columns
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) == "string"
+    }
+    return df.astype(string_columns) if string_columns else df
+
 def expand_resources(df: pd.DataFrame) -> pd.DataFrame:
     """
     Expands Security Hub findings that contain multiple resources into separate rows.
@@ -66,17 +90,26 @@ def expand_resources(df: pd.DataFrame) -> pd.DataFrame:
         return df
     
     try:
-        exploded = df.explode("Resources")
-        exploded = exploded.dropna(subset=["Resources"])
+        # Number of resources on each finding (anything but a list counts as 0)
+        lengths = df["Resources"].map(lambda r: len(r) if isinstance(r, list) else 0).to_numpy(dtype=int)
         
-        if exploded.empty:
+        if not lengths.any():
             return df
         
-        resources_df = pd.json_normalize(exploded["Resources"], sep="_")
-        resources_df.columns = ["Resource_" + col for col in resources_df.columns]
+        # Repeat each finding once per resource, e.g. lengths [2, 0, 1] -> rows [0, 0, 2]
+        row_idx = np.repeat(np.arange(len(df)), lengths)
+        exploded = df.drop(columns=["Resources"]).iloc[row_idx].reset_index(drop=True)
+        
+        flat_resources = list(itertools.chain.from_iterable(df["Resources"][lengths > 0]))
+        resources_df = pd.json_normalize(flat_resources, sep="_")
+        # Nested tag maps are flattened to one column per tag key. Name them
+        # Tag_<key> so later steps can work on whole columns, not per-row dicts.
+        resources_df.columns = [
+            TAG_PREFIX + col[len("Tags_"):] if col.startswith("Tags_") else "Resource_" + col
+            for col in resources_df.columns
+        ]
         
-        result = exploded.drop(columns=["Resources"]).reset_index(drop=True).join(resources_df)
-        return result
+        return pd.concat([exploded, resources_df], axis=1)
         
     except Exception as e:
         print(f"Error expanding resources: {e}")
@@ -89,11 +122,15 @@ def add_business_logic_columns(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
         
-    df = df.copy()
+    # New and updated columns are collected here and set on a shallow copy at
+    # the end, so the input frame's data is never deep-copied.
+    new_cols = {}
     
     try:
-        if "CreatedAt" in df.columns:
-            df["CreatedAt"] = pd.to_datetime(df["CreatedAt"], errors='coerce')
+        created_at = df["CreatedAt"] if "CreatedAt" in df.columns else None
+        # findings_to_dataframe() already parses CreatedAt – only parse raw strings
+        if created_at is not None and not pd.api.types.is_datetime64_any_dtype(created_at):
+            created_at = new_cols["CreatedAt"] = pd.to_datetime(created_at, errors='coerce', utc=True)
         
         severity_map = {
             "INFORMATIONAL": 0,
@@ -103,43 +140,51 @@ def add_business_logic_columns(df: pd.DataFrame) -> pd.DataFrame:
             "CRITICAL": 4
         }
         
+        severity_level = df["SeverityLevel"] if "SeverityLevel" in df.columns else None
         if "Severity" in df.columns:
-            df["SeverityLevel"] = df["Severity"].map(severity_map).fillna(0).astype(int)
+            severity_level = new_cols["SeverityLevel"] = df["Severity"].map(severity_map).fillna(0).astype(int)
         
-        if "CreatedAt" in df.columns:
+        if created_at is not None:
             now = pd.Timestamp.utcnow()
-            df["AgeDays"] = (now - df["CreatedAt"]).dt.days
+            age_days = new_cols["AgeDays"] = (now - created_at).dt.days
             
-            if "SeverityLevel" in df.columns:
-                sla_days = df["SeverityLevel"].map({4: 1, 3: 7, 2: 30, 1: 90, 0: 365})
-                df["SLAViolation"] = df["AgeDays"] > sla_days
+            if severity_level is not None:
+                sla_days = severity_level.map({4: 1, 3: 7, 2: 30, 1: 90, 0: 365})
+                new_cols["SLAViolation"] = age_days > sla_days
         
-        if "Resource_Tags" in df.columns:
-            df["Owner"] = df["Resource_Tags"].apply(
-                lambda tags: extract_tag_value(tags, ["Owner", "owner", "Team", "team"])
-            )
-            df["Environment"] = df["Resource_Tags"].apply(
-                lambda tags: extract_tag_value(tags, ["Environment", "Env", "Stage"])
+        tag_columns = [col for col in df.columns if col.startswith(TAG_PREFIX)]
+        tags_df = None
+        if tag_columns:
+            # expand_resources() already produced one column per tag key
+            tags_df = df[tag_columns].rename(columns=lambda col: col[len(TAG_PREFIX):])
+        elif "Resource_Tags" in df.columns:
+            # Spread raw tag dicts into one column per tag key, once
+            tags_df = pd.DataFrame.from_records(
+                [tags if isinstance(tags, dict) else {} for tags in df["Resource_Tags"]],
+                index=df.index
             )
         
-        return df
+        if tags_df is not None:
+            new_cols["Owner"] = extract_tag_value(tags_df, ["Owner", "owner", "Team", "team"])
+            new_cols["Environment"] = extract_tag_value(tags_df, ["Environment", "Env", "Stage"])
+        
+        # assign() would deep-copy the whole frame unless copy-on-write is on
+        out = df.copy(deep=False)
+        for col, values in new_cols.items():
+            out[col] = values
+        return out
         
     except Exception as e:
         print(f"Error adding business logic columns: {e}")
         return df
 
-def extract_tag_value(tags_dict: dict, possible_keys: list[str]) -> str:
+def extract_tag_value(tags_df: pd.DataFrame, possible_keys: list[str]) -> pd.Series:
     """
     Helper function to extract tag values using multiple possible key names.
+    `tags_df` holds one column per tag key; the first key present in each row wins.
     """
-    if not isinstance(tags_dict, dict):
-        return "Unknown"
-    
-    for key in possible_keys:
-        if key in tags_dict:
-            return str(tags_dict[key])
-    
-    return "Unknown"
+    values = tags_df.reindex(columns=possible_keys).bfill(axis=1).iloc[:, 0]
+    return values.fillna("Unknown").astype(str)
 
 def preview_dataframe_analysis(df: pd.DataFrame, name: str = "DataFrame") -> None:
     """
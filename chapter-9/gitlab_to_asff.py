@@ -21,7 +21,8 @@ How to use this file in your own pipeline
 A minimal job definition is provided in `gitlab-ci-example.yml`, but the high-
 level steps are:
 
-*   Install the Python dependencies (`boto3` only).
+*   Install the Python dependencies (`boto3`, plus `orjson` for faster parsing
+    of large reports – optional).
 *   Export your AWS credentials as environment variables – the IAM user or role
     only needs the **`securityhub:BatchImportFindings`** permission.
 *   Make sure the GitLab scan artifacts (usually `gl-sast-report.json` and
@@ -33,75 +34,146 @@ For beginners: don’t worry if ASFF looks overwhelming. The
 you only need to supply a few high-level parameters.
 """
 
+import itertools
 import json
 import boto3
 import datetime
 import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional – fall back to the standard library
+    _json_loads = json.loads
+
+# Security Hub accepts max 100 findings per BatchImportFindings call
+BATCH_SIZE = 100
+# Number of batches in flight at once – the calls are I/O bound, so threads help
+MAX_WORKERS = 8
+
+# Map GitLab severity to AWS Security Hub severity
+SEVERITY_MAP = {
+    "Critical": "CRITICAL",
+    "High": "HIGH",
+    "Medium": "MEDIUM",
+    "Low": "LOW",
+    "Info": "INFORMATIONAL"
+}
 
 def load_gitlab_findings(filename):
     """Load GitLab security scan results from JSON report file."""
     try:
-        with open(filename, 'r') as f:
-            gitlab_report = json.load(f)
+        with open(filename, 'rb') as f:
+            gitlab_report = _json_loads(f.read())
         return gitlab_report.get('vulnerabilities', [])
     except FileNotFoundError:
         print(f"No {filename} found, skipping...")
         return []
 
-def transform_to_asff(finding, product_name, region, aws_account):
-    """Transform GitLab finding to ASFF format for Security Hub."""
-    now = datetime.datetime.utcnow().isoformat() + 'Z'
-    
-    # Map GitLab severity to AWS Security Hub severity
-    severity_map = {
-        "Critical": "CRITICAL",
-        "High": "HIGH", 
-        "Medium": "MEDIUM",
-        "Low": "LOW",
-        "Info": "INFORMATIONAL"
-    }
-    
-    return {
+def utc_timestamp():
+    """Current UTC time in the ISO 8601 format expected by ASFF."""
+    return datetime.datetime.utcnow().isoformat() + 'Z'
+
+def make_transformer(product_name, region, aws_account, now=None):
+    """Build a GitLab-to-ASFF transform function for one scanner.
+
+    The ASFF fields that are the same for every finding from this scanner are
+    built once here; the returned function only fills in the per-finding ones.
+    """
+    if now is None:
+        now = utc_timestamp()
+
+    base = {
         "SchemaVersion": "2018-10-08",
-        "Id": f"{product_name}-{finding.get('id', 'unknown')}",
         "ProductArn": f"arn:aws:securityhub:{region}:{aws_account}:product/{aws_account}/default",
         "GeneratorId": f"{product_name}-Scanner",
         "AwsAccountId": aws_account,
-        "Types": ["Software and Configuration Checks/Vulnerabilities"],
         "CreatedAt": now,
         "UpdatedAt": now,
-        "Severity": {
-            "Label": severity_map.get(finding.get('severity', 'Unknown'), "INFORMATIONAL")
-        },
-        "Title": finding.get('name', f"{product_name} Security Finding"),
-        "Description": finding.get('description', 'Security vulnerability detected'),
-        "Resources": [{
-            "Type": "Other",
-            "Id": finding.get('location', {}).get('file', 'Unknown file')
-        }],
-        "Remediation": {
-            "Recommendation": {
-                "Text": finding.get('solution', 'Review GitLab security report for remediation guidance')
-            }
-        },
         "RecordState": "ACTIVE",
         "WorkflowState": "NEW"
     }
+    default_title = f"{product_name} Security Finding"
+
+    def transform(finding):
+        return {
+            **base,
+            "Id": f"{product_name}-{finding.get('id', 'unknown')}",
+            # A fresh list per finding - the base dict is only merged shallowly
+            "Types": ["Software and Configuration Checks/Vulnerabilities"],
+            "Severity": {
+                "Label": SEVERITY_MAP.get(finding.get('severity', 'Unknown'), "INFORMATIONAL")
+            },
+            "Title": finding.get('name', default_title),
+            "Description": finding.get('description', 'Security vulnerability detected'),
+            "Resources": [{
+                "Type": "Other",
+                "Id": finding.get('location', {}).get('file', 'Unknown file')
+            }],
+            "Remediation": {
+                "Recommendation": {
+                    "Text": finding.get('solution', 'Review GitLab security report for remediation guidance')
+                }
+            }
+        }
+
+    return transform
+
+def transform_to_asff(finding, product_name, region, aws_account, now=None):
+    """Transform GitLab finding to ASFF format for Security Hub.
+
+    For many findings, prefer `make_transformer()` so the shared fields are
+    only built once.
+    """
+    return make_transformer(product_name, region, aws_account, now)(finding)
+
+def iter_asff_findings(reports, region, aws_account, now=None):
+    """Lazily yield ASFF findings for each (report_file, product_name) pair."""
+    if now is None:
+        now = utc_timestamp()
+    for report_file, product_name in reports:
+        transform = make_transformer(product_name, region, aws_account, now)
+        for finding in load_gitlab_findings(report_file):
+            yield transform(finding)
+
+def _log_batch_result(future, batch_num):
+    response = future.result()
+    print(f"Sent batch {batch_num}: {response['SuccessCount']} successful, {response['FailureCount']} failed")
 
 def send_to_security_hub(asff_findings, region='us-east-1'):
-    """Send ASFF findings to AWS Security Hub."""
-    if not asff_findings:
+    """Send ASFF findings to AWS Security Hub.
+
+    `asff_findings` may be a list or a generator. Findings are pulled in batches
+    of 100 and up to MAX_WORKERS batches are imported concurrently, so only a
+    handful of batches are held in memory at any time.
+
+    Returns the number of findings sent.
+    """
+    findings = iter(asff_findings)
+    sh_client = boto3.Session(region_name=region).client('securityhub')
+
+    sent = 0
+    batch_num = 0
+    pending = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        while batch := list(itertools.islice(findings, BATCH_SIZE)):
+            # Wait for a free worker before reading more findings into memory
+            if len(pending) >= MAX_WORKERS:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    _log_batch_result(future, pending.pop(future))
+
+            batch_num += 1
+            sent += len(batch)
+            pending[executor.submit(sh_client.batch_import_findings, Findings=batch)] = batch_num
+
+        for future in as_completed(pending):
+            _log_batch_result(future, pending[future])
+
+    if not sent:
         print("No findings to send to Security Hub")
-        return
-    
-    sh_client = boto3.client('securityhub', region_name=region)
-    
-    # Security Hub accepts max 100 findings per batch
-    batch_size = 100
-    for i in range(0, len(asff_findings), batch_size):
-        batch = asff_findings[i:i + batch_size]
-        response = sh_client.batch_import_findings(Findings=batch)
-        print(f"Sent batch {i//batch_size + 1}: {response['SuccessCount']} successful, {response['FailureCount']} failed")
+    return sent
 
 if __name__ == "__main__":
     # These would be passed as environment variables in a real CI/CD pipeline
@@ -109,23 +181,16 @@ if __name__ == "__main__":
     aws_account = os.environ.get('AWS_ACCOUNT_ID', '123456789012')  # Replace with your AWS Account ID
     
     # In a real pipeline, these files would be artifacts from previous stages
-    sast_report_file = 'gl-sast-report.json'
-    dast_report_file = 'gl-dast-report.json'
+    reports = [
+        ('gl-sast-report.json', "GitLab-SAST"),
+        ('gl-dast-report.json', "GitLab-DAST"),
+    ]
 
-    # Load and transform SAST findings
-    sast_findings = load_gitlab_findings(sast_report_file)
-    dast_findings = load_gitlab_findings(dast_report_file)
-    
-    all_findings_asff = []
-    
-    for finding in sast_findings:
-        all_findings_asff.append(transform_to_asff(finding, "GitLab-SAST", region, aws_account))
-    
-    for finding in dast_findings:
-        all_findings_asff.append(transform_to_asff(finding, "GitLab-DAST", region, aws_account))
-    
-    if all_findings_asff:
-        send_to_security_hub(all_findings_asff, region)
-        print(f"Successfully processed {len(all_findings_asff)} security findings")
-    else:
-        print("No security findings detected in scans")
+    # Every finding in this pipeline run shares the same timestamp
+    now = utc_timestamp()
+
+    # Findings are transformed lazily as Security Hub batches are filled
+    sent = send_to_security_hub(iter_asff_findings(reports, region, aws_account, now), region)
+
+    if sent:
+        print(f"Successfully processed {sent} security findings")
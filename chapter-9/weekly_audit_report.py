@@ -14,12 +14,15 @@ steps every time it runs:
    Security Hub findings, screenshots, etc.).
 3. **Calculate compliance** – simple heuristics determine whether a control is
    `PASSED`, `FAILED` or `WARNING` based on the evidence.
-4. **Generate an Excel workbook** – four sheets are created using `pandas` and
-   `xlsxwriter`:
+4. **Generate an Excel workbook** – four sheets are streamed straight into a
+   workbook (no DataFrames needed). The Rust-based `fastxlsx` writer is used
+   when it is installed in the deployment package, otherwise `xlsxwriter`:
    * Executive Summary (KPIs)
    * Control Status (one row per control)
    * Failed Findings (sorted by severity)
    * All Evidence Details (full dump for power users)
+   Very large assessments skip the last sheet; the full dump is written to S3
+   as a gzipped CSV instead, which is far quicker to produce.
 5. **Store & Notify** – the workbook is uploaded to S3 and viewers receive a
    pre-signed URL via Amazon SES.
 
@@ -27,184 +30,534 @@ If you are new to AWS Lambda or Audit Manager don’t worry – each function be
 contains inline comments to guide you through the logic.
 """
 
+import csv
+import gzip
+import io
 import json
 import boto3
-import pandas as pd
-from datetime import datetime, timedelta
+import xlsxwriter
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
 from io import BytesIO
 import logging
 import os
+import tempfile
+import time
+import zipfile
+from contextlib import contextmanager
+from typing import NamedTuple
+
+try:
+    import fastxlsx
+except ImportError:  # No wheel for this platform/architecture – use xlsxwriter
+    fastxlsx = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class _FastZipFile(zipfile.ZipFile):
+    """ZipFile that deflates at ZIP_COMPRESSLEVEL unless told otherwise."""
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('compresslevel', ZIP_COMPRESSLEVEL)
+        super().__init__(*args, **kwargs)
+
+@contextmanager
+def _fast_zip_compression():
+    """Make xlsxwriter zip the workbook at a low compression level.
+
+    xlsxwriter has no option for this, so its ZipFile is swapped only while
+    the workbook is being closed (which is when the zip is written).
+    """
+    original = xlsxwriter.workbook.ZipFile
+    xlsxwriter.workbook.ZipFile = _FastZipFile
+    try:
+        yield
+    finally:
+        xlsxwriter.workbook.ZipFile = original
+
+class EvidenceRecord(NamedTuple):
+    """One row of evidence. Being a tuple, it can be written straight to a sheet."""
+    control_set_name: str
+    control_id: str
+    control_name: str
+    evidence_date: str
+    evidence_type: str
+    compliance_status: str
+    finding: str
+    resource_arn: str
+    severity: str
+
+# Sheet headers for EvidenceRecord rows, in field order
+EVIDENCE_COLUMNS = (
+    'ControlSetName', 'ControlId', 'ControlName', 'EvidenceDate', 'EvidenceType',
+    'ComplianceStatus', 'Finding', 'ResourceArn', 'Severity'
+)
+CONTROL_STATUS_COLUMNS = ('ControlSetName', 'ControlId', 'ControlName', 'ComplianceStatus', 'EvidenceDate')
+# Sort order for the "Failed Findings" sheet; unknown severities go last
+SEV_ORDER = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+# Controls fetched in parallel. Throttled calls are retried by botocore's
+# adaptive retry mode, and the connection pool is sized above the worker count.
+MAX_WORKERS = 16
+AUDIT_MANAGER_CONFIG = Config(retries={'mode': 'adaptive', 'max_attempts': 10}, max_pool_connections=32)
+# Largest maxResults accepted by the Audit Manager evidence APIs
+AUDIT_MANAGER_PAGE_SIZE = 1000
+
+# Pin SigV4 and virtual-hosted addressing so generate_presigned_url can sign
+# locally, without a bucket-location lookup on the first call (~50 ms cold).
+S3_CLIENT_CONFIG = Config(signature_version='s3v4', s3={'addressing_style': 'virtual'}, retries={'mode': 'standard'})
+
+# Above this many evidence rows the "All Evidence Details" sheet is replaced by
+# a gzipped CSV next to the workbook in S3
+DETAILS_SHEET_MAX_ROWS = 100_000
+
+# SendBulkTemplatedEmail accepts at most 50 destinations per call
+SES_BULK_BATCH_SIZE = 50
+
+# zlib level for the .xlsx zip: the report is short-lived and S3 upload time
+# dominates, so a slightly larger file is worth ~3x less compression CPU
+ZIP_COMPRESSLEVEL = 1
+
+# How long a cached copy of the assessment structure stays valid (seconds)
+ASSESSMENT_CACHE_TTL = 24 * 60 * 60
+
+# Workbooks above 8 MB are uploaded to S3 as parallel 8 MB parts
+S3_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024, multipart_chunksize=8 * 1024 * 1024, use_threads=True
+)
+
+def _folder_date(folder):
+    """Return an evidence folder's date as a `date`.
+
+    boto3 returns the folder `date` as a datetime; an ISO string is accepted too.
+    """
+    value = folder['date']
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
 class AuditReportGenerator:
     """Generates comprehensive SOC 2 audit reports from AWS Audit Manager evidence."""
     
     def __init__(self, region='us-east-1'):
         self.region = region
-        self.audit_manager = boto3.client('auditmanager', region_name=region)
-        self.s3 = boto3.client('s3', region_name=region)
-        self.ses = boto3.client('ses', region_name=region)
+        # boto3 clients are created on first use (see the properties below)
+        self._audit_manager = None
+        self._s3 = None
+        self._ses = None
         
         # Configuration - these should come from environment variables in production
         self.assessment_id = os.environ.get("ASSESSMENT_ID", "12345678-abcd-efgh-ijkl-1234567890ab")
         self.s3_bucket = os.environ.get("S3_BUCKET", "fafo-audit-reports")
         self.report_recipients = os.environ.get("REPORT_RECIPIENTS", "auditor@example.com").split(',')
         self.sender_email = os.environ.get("SENDER_EMAIL", "grc-automation@example.com")
+        self.email_template = os.environ.get("EMAIL_TEMPLATE", "WeeklyAuditReport")
+        self._email_template_ready = False
+        self.start_run()
+    
+    def start_run(self):
+        """Fix the report timestamp (UTC) used for the S3 key, workbook and email.
+
+        Call at the start of each invocation – the generator outlives a single run.
+        """
+        self.run_time = datetime.utcnow()
+    
+    # Lazy client accessors: building a client costs cold-start time, so a run
+    # that fails early never pays for the S3/SES clients it didn't reach.
+    @property
+    def audit_manager(self):
+        if self._audit_manager is None:
+            self._audit_manager = boto3.client('auditmanager', region_name=self.region, config=AUDIT_MANAGER_CONFIG)
+        return self._audit_manager
+
+    @audit_manager.setter
+    def audit_manager(self, client):
+        self._audit_manager = client
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            self._s3 = boto3.client('s3', region_name=self.region, config=S3_CLIENT_CONFIG)
+        return self._s3
+
+    @s3.setter
+    def s3(self, client):
+        self._s3 = client
+
+    @property
+    def ses(self):
+        if self._ses is None:
+            self._ses = boto3.client('ses', region_name=self.region)
+        return self._ses
+
+    @ses.setter
+    def ses(self, client):
+        self._ses = client
     
     def fetch_assessment_evidence(self):
-        """Retrieve complete assessment structure from AWS Audit Manager."""
+        """Retrieve complete assessment structure from AWS Audit Manager.
+
+        Only the control set / control ids and names the report uses are kept,
+        so a fresh fetch and a cache hit return the same shape. The structure
+        rarely changes, so it is cached in /tmp and reused by warm Lambda
+        containers for up to ASSESSMENT_CACHE_TTL seconds.
+        """
         try:
-            logger.info(f"Fetching assessment {self.assessment_id}")
-            response = self.audit_manager.get_assessment(assessmentId=self.assessment_id)
-            assessment = response['assessment']
+            assessment = self._load_cached_assessment()
+            if assessment is None:
+                logger.info(f"Fetching assessment {self.assessment_id}")
+                response = self.audit_manager.get_assessment(assessmentId=self.assessment_id)
+                assessment = self._report_structure(response['assessment'])
+                self._store_cached_assessment(assessment)
             logger.info(f"Retrieved assessment with {len(assessment['framework']['controlSets'])} control sets")
             return assessment
         except Exception as e:
             logger.error(f"Error fetching assessment: {e}")
             raise
     
+    def _assessment_cache_path(self):
+        return os.path.join(tempfile.gettempdir(), f"assessment_{self.assessment_id}.json")
+
+    def _load_cached_assessment(self):
+        path = self._assessment_cache_path()
+        try:
+            if time.time() - os.path.getmtime(path) >= ASSESSMENT_CACHE_TTL:
+                return None
+            with open(path) as f:
+                assessment = json.load(f)
+            logger.info(f"Using cached assessment {self.assessment_id}")
+            return assessment
+        except (OSError, ValueError):
+            return None
+
+    def _report_structure(self, assessment):
+        """Strip the assessment down to the plain-JSON control structure."""
+        return {'framework': {'controlSets': [
+            {
+                'id': cs['id'], 'name': cs.get('name'),
+                'controls': [{'id': c['id'], 'name': c.get('name')} for c in cs.get('controls', [])]
+            }
+            for cs in assessment['framework']['controlSets']
+        ]}}
+
+    def _store_cached_assessment(self, assessment):
+        path = self._assessment_cache_path()
+        try:
+            # Write to a temp file first so a concurrent reader never sees half a file
+            with open(path + '.tmp', 'w') as f:
+                json.dump(assessment, f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            logger.warning(f"Could not cache assessment: {e}")
+
     def collect_evidence_by_control(self, control_sets):
-        """Collect the latest evidence for each SOC 2 control."""
-        evidence_records = []
-        evidence_cutoff = datetime.utcnow() - timedelta(days=7)
+        """Collect the latest evidence for each SOC 2 control.
+
+        Controls are fetched on a thread pool so the network round-trips for
+        different controls overlap. The boto3 client is thread-safe and shared.
+        """
+        # Evidence from the last 7 days counts as "latest"
+        cutoff_date = (self.run_time - timedelta(days=7)).date()
         
+        work = []
         for cs in control_sets:
             logger.info(f"Processing control set: {cs.get('name')}")
-            for control in cs.get('controls', []):
-                try:
-                    folders = self.audit_manager.get_evidence_folders_by_assessment_control(
-                        assessmentId=self.assessment_id, controlSetId=cs['id'], controlId=control['id']
-                    ).get('evidenceFolders', [])
-                    
-                    if not folders:
-                        evidence_records.append(self._create_placeholder_record(cs, control))
-                        continue
-
-                    latest_evidence = []
-                    for folder in folders:
-                        if datetime.strptime(folder['date'], '%Y-%m-%d') >= evidence_cutoff.date():
-                            items = self._fetch_evidence_items(cs['id'], control['id'], folder['id'])
-                            latest_evidence.extend(self._process_evidence_items(items, cs, control, folder))
-
-                    if not latest_evidence:
-                        latest_folder = max(folders, key=lambda x: x['date'])
-                        items = self._fetch_evidence_items(cs['id'], control['id'], latest_folder['id'])
-                        latest_evidence.extend(self._process_evidence_items(items, cs, control, latest_folder))
-
-                    evidence_records.extend(latest_evidence)
-
-                except Exception as e:
-                    logger.warning(f"Error processing control {control['id']}: {e}")
-                    evidence_records.append(self._create_placeholder_record(cs, control, str(e)))
+            work.extend((cs, control) for control in cs.get('controls', []))
         
+        # Results are slotted back by position so the report order stays stable
+        results = [None] * len(work)
+        # Create the client before the threads start - client creation itself
+        # isn't thread-safe - and hand the same client to every worker
+        client = self.audit_manager
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self._fetch_one_control, client, cs, control, cutoff_date): idx
+                for idx, (cs, control) in enumerate(work)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        evidence_records = [record for records in results for record in records]
         logger.info(f"Collected {len(evidence_records)} evidence records")
         return evidence_records
 
+    def _fetch_one_control(self, client, cs, control, cutoff_date):
+        try:
+            folders = list(self._paginate(
+                client.get_evidence_folders_by_assessment_control, 'evidenceFolders',
+                assessmentId=self.assessment_id, controlSetId=cs['id'], controlId=control['id']
+            ))
+            
+            if not folders:
+                return [self._create_placeholder_record(cs, control)]
+
+            # Use every folder from the last 7 days, or failing that the newest
+            # folder we have. Either way each folder is fetched exactly once.
+            target_folders = [f for f in folders if _folder_date(f) >= cutoff_date]
+            if not target_folders:
+                target_folders = [max(folders, key=_folder_date)]
+
+            latest_evidence = []
+            for folder in target_folders:
+                items = self._fetch_evidence_items(client, cs['id'], control['id'], folder['id'])
+                latest_evidence.extend(self._process_evidence_items(items, cs, control, folder))
+
+            return latest_evidence
+
+        except Exception as e:
+            logger.warning(f"Error processing control {control['id']}: {e}")
+            return [self._create_placeholder_record(cs, control, str(e))]
+
     def _process_evidence_items(self, items, cs, control, folder):
+        # Everything that is the same for every item is looked up once, and the
+        # helper methods are bound to locals to keep the loop body cheap.
+        # The folder date is stored as a YYYY-MM-DD string for the sheets and CSV.
+        cs_name, ctrl_id, ctrl_name = cs.get('name'), control['id'], control.get('name')
+        ev_date = _folder_date(folder).isoformat()
+        det_status = self._determine_compliance_status
+        ex_arn = self._extract_resource_arn
+        ex_sev = self._extract_severity
         processed = []
+        append = processed.append
         for item in items:
-            processed.append({
-                'ControlSetName': cs.get('name'), 'ControlId': control['id'], 'ControlName': control.get('name'),
-                'EvidenceDate': folder.get('date'), 'EvidenceType': item.get('dataSource'),
-                'ComplianceStatus': self._determine_compliance_status(item),
-                'Finding': item.get('textResponse', ''),
-                'ResourceArn': self._extract_resource_arn(item),
-                'Severity': self._extract_severity(item)
-            })
+            status = det_status(item)
+            append(EvidenceRecord(
+                cs_name, ctrl_id, ctrl_name, ev_date, item.get('dataSource'),
+                status, item.get('textResponse', ''), ex_arn(item), ex_sev(item, status)
+            ))
         return processed
 
-    def _fetch_evidence_items(self, cs_id, ctrl_id, folder_id):
+    def _fetch_evidence_items(self, client, cs_id, ctrl_id, folder_id):
         try:
-            return self.audit_manager.get_evidence_by_evidence_folder(
+            return list(self._paginate(
+                client.get_evidence_by_evidence_folder, 'evidence',
                 assessmentId=self.assessment_id, controlSetId=cs_id, evidenceFolderId=folder_id
-            ).get('evidence', [])
+            ))
         except Exception as e:
             logger.warning(f"Error fetching evidence items: {e}")
             return []
 
+    def _paginate(self, operation, result_key, **params):
+        """Yield every item from a nextToken-paged Audit Manager call.
+
+        botocore has no paginators for the evidence APIs, so we follow
+        nextToken ourselves and ask for the largest page the API allows.
+        """
+        params['maxResults'] = AUDIT_MANAGER_PAGE_SIZE
+        while True:
+            page = operation(**params)
+            yield from page.get(result_key, [])
+            if not page.get('nextToken'):
+                return
+            params['nextToken'] = page['nextToken']
+
     def _create_placeholder_record(self, cs, control, reason='No evidence found'):
-        return {
-            'ControlSetName': cs.get('name'), 'ControlId': control['id'], 'ControlName': control.get('name'),
-            'EvidenceDate': 'No Evidence', 'EvidenceType': 'Manual Review Required',
-            'ComplianceStatus': 'UNKNOWN', 'Finding': reason,
-            'ResourceArn': 'N/A', 'Severity': 'LOW'
-        }
+        return EvidenceRecord(
+            control_set_name=cs.get('name'), control_id=control['id'], control_name=control.get('name'),
+            evidence_date='No Evidence', evidence_type='Manual Review Required',
+            compliance_status='UNKNOWN', finding=reason,
+            resource_arn='N/A', severity='LOW'
+        )
 
     def _determine_compliance_status(self, evidence):
         if 'complianceCheck' in evidence: return evidence['complianceCheck'].get('status', 'UNKNOWN').upper()
-        if 'findingComplianceStatus' in evidence.get('attributes', {}): return evidence['attributes']['findingComplianceStatus'].upper()
+        attrs = evidence.get('attributes', {})
+        if 'findingComplianceStatus' in attrs: return attrs['findingComplianceStatus'].upper()
         return 'UNKNOWN'
 
     def _extract_resource_arn(self, evidence):
         res = evidence.get('resourcesIncluded', [])
         return res[0].get('arn', 'N/A') if res else 'N/A'
 
-    def _extract_severity(self, evidence):
-        if 'findingSeverity' in evidence.get('attributes', {}): return evidence['attributes']['findingSeverity'].upper()
-        return 'MEDIUM' if self._determine_compliance_status(evidence) == 'FAILED' else 'LOW'
+    def _extract_severity(self, evidence, status):
+        """`status` is the item's already-computed compliance status."""
+        attrs = evidence.get('attributes', {})
+        if 'findingSeverity' in attrs: return attrs['findingSeverity'].upper()
+        return 'MEDIUM' if status == 'FAILED' else 'LOW'
 
     def generate_excel_report(self, evidence_records):
-        df = pd.DataFrame(evidence_records)
-        if df.empty: df = pd.DataFrame([self._create_placeholder_record({}, {'id':'N/A', 'name':'N/A'})])
+        if not evidence_records:
+            evidence_records = [self._create_placeholder_record({}, {'id': 'N/A', 'name': 'N/A'})]
         
+        # Each sheet is a (name, headers, rows) tuple, written by either backend
+        control_status, control_ids = self._aggregate_controls(evidence_records)
+        sheets = [
+            self._create_executive_summary_sheet(control_ids),
+            self._create_control_status_sheet(control_status),
+            self._create_failed_findings_sheet(evidence_records),
+        ]
+        if len(evidence_records) <= DETAILS_SHEET_MAX_ROWS:
+            sheets.append(('All Evidence Details', EVIDENCE_COLUMNS, evidence_records))
+        if fastxlsx is not None:
+            return self._write_workbook_fastxlsx(sheets)
+        return self._write_workbook_xlsxwriter(sheets)
+
+    def _write_workbook_xlsxwriter(self, sheets):
+        # constant_memory writes each row out as soon as it is complete (via a
+        # temp file in /tmp), so memory stays flat however many rows we have.
+        # Rows can't be revisited in this mode, so every sheet must already be
+        # in its final order (Control Status and Failed Findings are pre-sorted).
         excel_buffer = BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-            self._create_executive_summary_sheet(df, writer)
-            self._create_control_status_sheet(df, writer)
-            self._create_failed_findings_sheet(df, writer)
-            df.to_excel(writer, sheet_name='All Evidence Details', index=False)
+        workbook = xlsxwriter.Workbook(excel_buffer, {'constant_memory': True})
+        header_format = workbook.add_format({'bold': True, 'border': 1})
+        for name, headers, rows in sheets:
+            worksheet = workbook.add_worksheet(name)
+            worksheet.write_row(0, 0, headers, header_format)
+            for row_idx, row in enumerate(rows, start=1):
+                worksheet.write_row(row_idx, 0, row)
+        with _fast_zip_compression():
+            workbook.close()
         excel_buffer.seek(0)
         return excel_buffer
 
-    def _create_executive_summary_sheet(self, df, writer):
-        total = df['ControlId'].nunique()
-        passed = df[df['ComplianceStatus'] == 'PASSED']['ControlId'].nunique()
-        failed = df[df['ComplianceStatus'] == 'FAILED']['ControlId'].nunique()
+    def _write_workbook_fastxlsx(self, sheets):
+        workbook = fastxlsx.WriteOnlyWorkbook()
+        for name, headers, rows in sheets:
+            worksheet = workbook.create_sheet(name)
+            worksheet.write_row((0, 0), list(headers), dtype=fastxlsx.DType.Str)
+            # fastxlsx is fastest column by column with a single declared type
+            for col_idx, column in enumerate(zip(*rows)):
+                column = list(column)
+                all_text = all(isinstance(value, str) for value in column)
+                worksheet.write_column((1, col_idx), column,
+                                       dtype=fastxlsx.DType.Str if all_text else fastxlsx.DType.Any)
+        # fastxlsx can only save to a path, so go via a temp file in /tmp
+        fd, path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        try:
+            workbook.save(path)
+            with open(path, 'rb') as f:
+                return BytesIO(f.read())
+        finally:
+            os.remove(path)
+
+    def _aggregate_controls(self, evidence_records):
+        """One pass over the evidence that feeds both the summary and status sheets.
+
+        Returns `control_status`, mapping (set name, control id, control name) to
+        [first status seen, most recent evidence date], and `control_ids`, the
+        sets of control ids seen overall ('ALL') and with PASSED/FAILED evidence.
+        """
+        control_status = {}
+        control_ids = {'ALL': set(), 'PASSED': set(), 'FAILED': set()}
+        for r in evidence_records:
+            control_id, status, evidence_date = r.control_id, r.compliance_status, r.evidence_date
+            control_ids['ALL'].add(control_id)
+            if status in ('PASSED', 'FAILED'):
+                control_ids[status].add(control_id)
+            key = (r.control_set_name, control_id, r.control_name)
+            current = control_status.get(key)
+            if current is None:
+                control_status[key] = [status, evidence_date]
+            elif (evidence_date or '') > (current[1] or ''):
+                current[1] = evidence_date
+        return control_status, control_ids
+
+    def _create_executive_summary_sheet(self, control_ids):
+        total = len(control_ids['ALL'])
+        passed = len(control_ids['PASSED'])
+        failed = len(control_ids['FAILED'])
         rate = (passed / total * 100) if total > 0 else 0
-        summary_df = pd.DataFrame({
-            'Metric': ['Total Controls', 'Passing', 'Failing', 'Compliance Rate (%)', 'Generated'],
-            'Value': [total, passed, failed, f"{rate:.1f}%", datetime.now().strftime('%Y-%m-%d %H:%M')]
-        })
-        summary_df.to_excel(writer, sheet_name='Executive Summary', index=False)
-
-    def _create_control_status_sheet(self, df, writer):
-        status_df = df.groupby(['ControlSetName', 'ControlId', 'ControlName']).agg(
-            ComplianceStatus=('ComplianceStatus', 'first'), EvidenceDate=('EvidenceDate', 'max')
-        ).reset_index()
-        status_df.to_excel(writer, sheet_name='Control Status', index=False)
-
-    def _create_failed_findings_sheet(self, df, writer):
-        failed_df = df[df['ComplianceStatus'].isin(['FAILED', 'WARNING'])].copy()
-        if failed_df.empty:
-            failed_df = pd.DataFrame([{'Status': 'No failed findings'}])
-        else:
-            sev_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
-            failed_df['SevSort'] = failed_df['Severity'].map(sev_order)
-            failed_df = failed_df.sort_values('SevSort')
-        failed_df.to_excel(writer, sheet_name='Failed Findings', index=False)
+        rows = [
+            ('Total Controls', total), ('Passing', passed), ('Failing', failed),
+            ('Compliance Rate (%)', f"{rate:.1f}%"), ('Generated', self.run_time.strftime('%Y-%m-%d %H:%M'))
+        ]
+        return 'Executive Summary', ('Metric', 'Value'), rows
+
+    def _create_control_status_sheet(self, control_status):
+        rows = (
+            key + tuple(value)
+            for key, value in sorted(control_status.items(), key=lambda kv: tuple(str(k or '') for k in kv[0]))
+        )
+        return 'Control Status', CONTROL_STATUS_COLUMNS, rows
+
+    def _create_failed_findings_sheet(self, evidence_records):
+        failed = [r for r in evidence_records if r.compliance_status in ('FAILED', 'WARNING')]
+        if not failed:
+            return 'Failed Findings', ('Status',), [('No failed findings',)]
+        failed.sort(key=lambda r: SEV_ORDER.get(r.severity, 99))
+        return 'Failed Findings', EVIDENCE_COLUMNS, failed
 
     def store_report_in_s3(self, excel_buffer):
-        date_path = datetime.now().strftime('%Y/%m/%d')
-        filename = f"SOC2_Weekly_Report_{datetime.now().strftime('%Y%m%d_%H%M')}.xlsx"
+        date_path = self.run_time.strftime('%Y/%m/%d')
+        filename = f"SOC2_Weekly_Report_{self.run_time.strftime('%Y%m%d_%H%M')}.xlsx"
         s3_key = f"weekly-reports/{date_path}/{filename}"
-        self.s3.put_object(Bucket=self.s3_bucket, Key=s3_key, Body=excel_buffer.getvalue())
+        # upload_fileobj reads the buffer in chunks (switching to a threaded
+        # multipart upload for large files) instead of copying it into memory
+        excel_buffer.seek(0)
+        self.s3.upload_fileobj(excel_buffer, self.s3_bucket, s3_key, Config=S3_TRANSFER_CONFIG)
         logger.info(f"Stored report in S3: s3://{self.s3_bucket}/{s3_key}")
         return s3_key
 
-    def send_notification(self, s3_key):
-        presigned_url = self.s3.generate_presigned_url('get_object', 
+    def store_evidence_details_in_s3(self, evidence_records, s3_key):
+        """Upload the full evidence dump as a gzipped CSV when it is too big for the workbook.
+
+        Returns the CSV's S3 key, or None when the workbook already holds the details.
+        """
+        if len(evidence_records) <= DETAILS_SHEET_MAX_ROWS:
+            return None
+        csv_buffer = BytesIO()
+        with gzip.GzipFile(fileobj=csv_buffer, mode='wb', compresslevel=1) as gz:
+            with io.TextIOWrapper(gz, encoding='utf-8', newline='') as text:
+                writer = csv.writer(text)
+                writer.writerow(EVIDENCE_COLUMNS)
+                writer.writerows(evidence_records)
+        csv_buffer.seek(0)
+        details_key = s3_key.replace('.xlsx', '_details.csv.gz')
+        self.s3.upload_fileobj(csv_buffer, self.s3_bucket, details_key, Config=S3_TRANSFER_CONFIG)
+        logger.info(f"Stored {len(evidence_records)} evidence rows in S3: s3://{self.s3_bucket}/{details_key}")
+        return details_key
+
+    def _ensure_email_template(self):
+        """Create or refresh the SES template used by send_notification."""
+        if self._email_template_ready:
+            return
+        template = {
+            'TemplateName': self.email_template,
+            'SubjectPart': "Weekly SOC 2 Audit Report - {{report_date}}",
+            'TextPart': (
+                "The weekly SOC 2 compliance report is ready.\n\nDownload (expires in 7 days):\n{{{presigned_url}}}"
+                "{{#if details_url}}\n\nFull evidence details (CSV, expires in 7 days):\n{{{details_url}}}{{/if}}"
+            )
+        }
+        try:
+            self.ses.update_template(Template=template)
+        except self.ses.exceptions.TemplateDoesNotExistException:
+            logger.info(f"Creating SES template {self.email_template}")
+            self.ses.create_template(Template=template)
+        self._email_template_ready = True
+
+    def _presign(self, s3_key):
+        return self.s3.generate_presigned_url('get_object',
             Params={'Bucket': self.s3_bucket, 'Key': s3_key}, ExpiresIn=604800)
-        subject = f"Weekly SOC 2 Audit Report - {datetime.now().strftime('%Y-%m-%d')}"
-        body = f"The weekly SOC 2 compliance report is ready.\n\nDownload (expires in 7 days):\n{presigned_url}"
-        self.ses.send_email(
-            Source=self.sender_email,
-            Destination={'ToAddresses': self.report_recipients},
-            Message={'Subject': {'Data': subject}, 'Body': {'Text': {'Data': body}}}
-        )
-        logger.info(f"Sent notifications to {len(self.report_recipients)} recipients")
+
+    def send_notification(self, s3_key, details_key=None):
+        self._ensure_email_template()
+        template_data = {'report_date': self.run_time.strftime('%Y-%m-%d'), 'presigned_url': self._presign(s3_key)}
+        if details_key:
+            template_data['details_url'] = self._presign(details_key)
+        template_data = json.dumps(template_data)
+        # One destination per recipient, so a bounce only affects that recipient
+        failed = 0
+        for i in range(0, len(self.report_recipients), SES_BULK_BATCH_SIZE):
+            batch = self.report_recipients[i:i + SES_BULK_BATCH_SIZE]
+            response = self.ses.send_bulk_templated_email(
+                Source=self.sender_email,
+                Template=self.email_template,
+                DefaultTemplateData=template_data,
+                Destinations=[{'Destination': {'ToAddresses': [recipient]}} for recipient in batch]
+            )
+            for recipient, status in zip(batch, response['Status']):
+                if status['Status'] != 'Success':
+                    failed += 1
+                    logger.warning(f"Could not send report to {recipient}: {status.get('Error', status['Status'])}")
+        # A few bounced recipients are tolerated, but not a run that reached nobody
+        if failed == len(self.report_recipients):
+            raise RuntimeError(f"Report notification failed for all {failed} recipients")
+        logger.info(f"Sent notifications to {len(self.report_recipients) - failed} of {len(self.report_recipients)} recipients")
 
 # ---------------------------------------------------------------------------
 # Lambda entry-point
@@ -213,15 +566,19 @@ class AuditReportGenerator:
 # EventBridge schedule defined in `lambda-scheduler.yml` fires (every Friday).
 # ---------------------------------------------------------------------------
 
+# Built once per Lambda container so warm invocations reuse the boto3 clients
+generator = AuditReportGenerator()
+
 def lambda_handler(event, context):
     try:
         logger.info("Starting weekly audit report generation")
-        generator = AuditReportGenerator()
+        generator.start_run()
         assessment = generator.fetch_assessment_evidence()
         evidence = generator.collect_evidence_by_control(assessment['framework']['controlSets'])
         report = generator.generate_excel_report(evidence)
         s3_key = generator.store_report_in_s3(report)
-        generator.send_notification(s3_key)
+        details_key = generator.store_evidence_details_in_s3(evidence, s3_key)
+        generator.send_notification(s3_key, details_key)
         return {'statusCode': 200, 'body': json.dumps({'message': 'Report generated successfully'})}
     except Exception as e:
         logger.error(f"Failed to generate report: {e}")